@@ -1,7 +1,8 @@
-from flask import Flask
+from flask import Flask, Request, request, g, jsonify, current_app
 from flask_cors import CORS
 import os
 import logging
+import tempfile
 
 # Optional dotenv
 try:
@@ -16,7 +17,41 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Request size limits (bytes), per blueprint; MAX_CONTENT_LENGTH caps everything else
+BODY_LIMITS = {
+    "analyze": int(os.getenv("MAX_ANALYZE_BYTES", 1024 * 1024)),
+    "audio": int(os.getenv("MAX_AUDIO_BYTES", 100 * 1024 * 1024)),
+    "pdf": int(os.getenv("MAX_PDF_BYTES", 2 * 1024 * 1024)),
+    "export": int(os.getenv("MAX_EXPORT_BYTES", 2 * 1024 * 1024)),
+}
+# Werkzeug spools uploaded file parts above 500 KB to a temp file; this makes that threshold configurable
+SPOOL_THRESHOLD_BYTES = int(os.getenv("SPOOL_THRESHOLD_BYTES", 500 * 1024))
+# Non-file form fields are always held in memory, so cap them
+MAX_FORM_MEMORY_BYTES = int(os.getenv("MAX_FORM_MEMORY_BYTES", 500 * 1024))
+# Endpoints that never take a body and must stay reachable when the byte budget is full
+UNMETERED_ENDPOINTS = {"health_check", "admission_usage"}
+
+
+class LimitedRequest(Request):
+    """
+    Request that applies the per-blueprint body limit.
+    Werkzeug checks max_content_length against Content-Length and also caps
+    reads from the input stream at it.
+    """
+
+    max_form_memory_size = MAX_FORM_MEMORY_BYTES
+
+    @property
+    def max_content_length(self):
+        return BODY_LIMITS.get(self.blueprint, current_app.config["MAX_CONTENT_LENGTH"])
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=SPOOL_THRESHOLD_BYTES, mode="rb+")
+
+
 app = Flask(__name__)
+app.request_class = LimitedRequest
+app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", max(BODY_LIMITS.values())))
 
 # CORS config - Allow all origins for development (restrict in production)
 # In production, set FRONTEND_URL environment variable
@@ -42,20 +77,80 @@ else:
         }
     })
 
+from services.admission import admission_controller, AdmissionRejected
+
 # Import routes
 from routes.audio import audio_bp
 from routes.analyze import analyze_bp
 from routes.pdf import pdf_bp
+from routes.export import export_bp
 
 # Register blueprints
 app.register_blueprint(audio_bp, url_prefix="/api/audio")
 app.register_blueprint(analyze_bp, url_prefix="/api")
 app.register_blueprint(pdf_bp, url_prefix="/api")
+app.register_blueprint(export_bp, url_prefix="/api")
+
+@app.before_request
+def admit_request():
+    """Reject oversized bodies (413) and requests over the in-flight byte budget (503)."""
+    if request.method in ("GET", "HEAD", "OPTIONS") or request.endpoint in UNMETERED_ENDPOINTS:
+        return None
+
+    limit = request.max_content_length
+    if request.content_length is not None and request.content_length > limit:
+        logging.warning(f"Rejected {request.path}: body {request.content_length} bytes exceeds {limit}")
+        return jsonify({
+            "error": "Request body too large",
+            "max_bytes": limit
+        }), 413
+
+    # Werkzeug only truncates chunked bodies at the limit, so ask for a length up front
+    if request.headers.get("Transfer-Encoding", "").lower() == "chunked":
+        return jsonify({"error": "Content-Length is required"}), 411
+
+    nbytes = request.content_length or 0
+    admission_controller.admit_bytes(nbytes)
+    g.admitted_bytes = nbytes
+
+
+@app.teardown_request
+def release_request(exc):
+    nbytes = g.pop("admitted_bytes", None)
+    if nbytes is not None:
+        admission_controller.release_bytes(nbytes)
+
+
+@app.errorhandler(AdmissionRejected)
+def handle_admission_rejected(e):
+    logging.warning(f"Admission rejected for {request.path}: {e}")
+    return jsonify({"error": str(e)}), 503, {"Retry-After": str(e.retry_after)}
+
+
+@app.errorhandler(413)
+def handle_too_large(e):
+    limit = request.max_content_length
+    # A body within the route limit can only trip the form field cap
+    if request.content_length is not None and request.content_length <= limit:
+        return jsonify({
+            "error": "Form field too large",
+            "max_bytes": MAX_FORM_MEMORY_BYTES
+        }), 413
+    return jsonify({
+        "error": "Request body too large",
+        "max_bytes": limit
+    }), 413
+
 
 @app.route("/api/health", methods=["GET"])
 def health_check():
     return {"status": "ok", "message": "Backend running"}, 200
 
+
+@app.route("/api/admission", methods=["GET"])
+def admission_usage():
+    return admission_controller.usage(), 200
+
 if __name__ == "__main__":
     port = int(os.getenv("FLASK_PORT", 5000))
     debug = os.getenv("FLASK_DEBUG", "false").lower() == "true"
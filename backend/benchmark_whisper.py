@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Compare batched Whisper decoding (WhisperBatcher, used by /api/audio/upload and
+/api/audio/process) with unbatched per-request model.transcribe().
+
+    python benchmark_whisper.py                  # real "base" weights, sample clips in uploads/
+    python benchmark_whisper.py --random-weights # compute-only: no downloads, no accuracy
+
+With real weights it reports utterances/second for both paths and the word
+error rate of the batched transcripts against model.transcribe() as reference.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+
+from services.whisper_batcher import WhisperBatcher
+
+# Dimensions of the "base" checkpoint
+BASE_DIMS = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=512, n_audio_head=8, n_audio_layer=6,
+    n_vocab=51865, n_text_ctx=448, n_text_state=512, n_text_head=8, n_text_layer=6
+)
+
+
+def load_audio(path):
+    """16 kHz mono float32; reads WAV directly so ffmpeg is only needed for other formats."""
+    if path.endswith(".wav"):
+        with wave.open(path) as f:
+            if f.getframerate() == whisper.audio.SAMPLE_RATE and f.getnchannels() == 1 and f.getsampwidth() == 2:
+                return np.frombuffer(f.readframes(f.getnframes()), np.int16).astype(np.float32) / 32768.0
+    return whisper.load_audio(path)
+
+
+def batched_transcribe(batcher, audio):
+    """Same window loop as routes.audio._transcribe_segments."""
+    texts = []
+    start = 0
+    while start < len(audio):
+        text, consumed = batcher.transcribe(audio[start:start + whisper.audio.N_SAMPLES])
+        if text:
+            texts.append(text)
+        start += consumed
+    return " ".join(texts).strip()
+
+
+def word_error_rate(reference, hypothesis):
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    dist = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, dist[0] = dist[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, dist[j] = dist[j], min(dist[j] + 1, dist[j - 1] + 1, prev + (r != h))
+    return dist[-1] / max(len(ref), 1)
+
+
+def benchmark_real(model, clips, concurrency):
+    print(f"Sequential model.transcribe() on {len(clips)} clips...")
+    started = time.monotonic()
+    references = [
+        model.transcribe(audio, task="translate", language="en", fp16=False)["text"].strip()
+        for audio in clips
+    ]
+    sequential = time.monotonic() - started
+
+    batcher = WhisperBatcher(model)
+    print(f"Batched decoding with {concurrency} concurrent requests...")
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        hypotheses = list(pool.map(lambda audio: batched_transcribe(batcher, audio), clips))
+    batched = time.monotonic() - started
+
+    wers = [word_error_rate(ref, hyp) for ref, hyp in zip(references, hypotheses)]
+    print(f"  transcribe():  {len(clips) / sequential:.2f} utterances/s ({sequential:.1f}s)")
+    print(f"  batched:       {len(clips) / batched:.2f} utterances/s ({batched:.1f}s)")
+    print(f"  WER vs transcribe(): mean {np.mean(wers):.3f}, max {np.max(wers):.3f}")
+
+
+def benchmark_random(model, windows, batch_size, sample_len):
+    """Forward-pass cost only: greedy decode of fixed-length windows, one at a time vs batched."""
+    options = whisper.DecodingOptions(task="translate", language="en", fp16=False, sample_len=sample_len)
+    mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(w), n_mels=model.dims.n_mels) for w in windows]
+
+    started = time.monotonic()
+    for mel in mels:
+        whisper.decode(model, mel, options)
+    sequential = time.monotonic() - started
+
+    started = time.monotonic()
+    for i in range(0, len(mels), batch_size):
+        whisper.decode(model, torch.stack(mels[i:i + batch_size]), options)
+    batched = time.monotonic() - started
+
+    print(f"  {len(mels)} windows, {sample_len} tokens each, batch size {batch_size}")
+    print(f"  one at a time: {len(mels) / sequential:.2f} windows/s ({sequential:.1f}s)")
+    print(f"  batched:       {len(mels) / batched:.2f} windows/s ({batched:.1f}s)")
+    print(f"  speedup:       {sequential / batched:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--random-weights", action="store_true",
+                        help="use an untrained base-sized model (throughput only)")
+    parser.add_argument("--clips", type=int, default=8, help="number of clips / windows")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="concurrent requests (real mode) / batch size (random mode)")
+    parser.add_argument("--sample-len", type=int, default=32, help="tokens per window (random mode)")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    samples = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads", "*.wav")))
+    clips = [load_audio(path) for path in samples[:args.clips]]
+    if not clips:
+        print("No sample .wav files in uploads/")
+        return 1
+    while len(clips) < args.clips:
+        clips.append(clips[len(clips) % len(samples)])
+
+    if args.random_weights:
+        model = Whisper(BASE_DIMS).eval()
+        # Some parameters are allocated with torch.empty and filled from the checkpoint
+        with torch.no_grad():
+            for param in model.parameters():
+                param.normal_(0, 0.02)
+        windows = [clip[:whisper.audio.N_SAMPLES] for clip in clips]
+        print(f"Random-weight base model, {torch.get_num_threads()} CPU threads")
+        benchmark_random(model, windows, args.concurrency, args.sample_len)
+    else:
+        model = whisper.load_model("base")
+        benchmark_real(model, clips, args.concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.llm_service import LLMService
+from services.admission import admission_controller, AdmissionRejected
+from werkzeug.exceptions import RequestEntityTooLarge
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,12 +45,15 @@ def analyze():
         logger.info(f'Analyzing content of type: {content_type}, length: {len(content_stripped)}')
         
         # Call LLM service for analysis
-        result = llm_service.analyze_content(content, content_type)
+        with admission_controller.operation('llm'):
+            result = llm_service.analyze_content(content, content_type)
         
         logger.info(f'Analysis complete. Topics found: {len(result.get("keyTopics", []))}')
         
         return jsonify(result), 200
         
+    except (AdmissionRejected, RequestEntityTooLarge):
+        raise
     except Exception as e:
         logger.error(f'Error in analyze endpoint: {str(e)}', exc_info=True)
         error_message = str(e)
@@ -1,7 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from concurrent.futures import ThreadPoolExecutor
+from services.llm_service import LLMService
+from services.admission import admission_controller, AdmissionRejected
+from services.whisper_batcher import WhisperBatcher
 import whisper
 import os
 import uuid
+import json
 import subprocess
 import logging
 
@@ -11,68 +16,173 @@ logger = logging.getLogger(__name__)
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Pipeline tuning: transcript characters buffered before a chunk goes to the LLM,
+# LLM-summarized chunks per request, chunks one request may have in flight, and
+# how long the final condense step waits for an "llm" admission slot
+PIPELINE_CHUNK_CHARS = int(os.getenv("PIPELINE_CHUNK_CHARS", 1200))
+PIPELINE_MAX_CHUNKS = int(os.getenv("PIPELINE_MAX_CHUNKS", 8))
+PIPELINE_MAX_INFLIGHT = int(os.getenv("PIPELINE_MAX_INFLIGHT", 1))
+PIPELINE_LLM_WAIT = float(os.getenv("PIPELINE_LLM_WAIT", 30))
+
 # Load Whisper ONCE
 logger.info("Loading Whisper model...")
 model = whisper.load_model("base")
 logger.info("Whisper model loaded")
 
+# All transcription goes through the batcher so concurrent requests share forward
+# passes and no request holds the model for a whole recording
+batcher = WhisperBatcher(model)
+
+llm_service = LLMService()
+# Every task holds an "llm" slot, so the pool never needs more workers than slots
+pipeline_executor = ThreadPoolExecutor(max_workers=admission_controller.operation_limits["llm"])
+
+
+def _save_and_convert(audio_file):
+    """Save the uploaded file and convert it to 16 kHz mono WAV. Returns the WAV path."""
+    raw_name = f"{uuid.uuid4().hex}.webm"
+    raw_path = os.path.join(UPLOAD_FOLDER, raw_name)
+    audio_file.save(raw_path)
+
+    logger.info(f"Audio saved: {raw_path}")
+
+    wav_path = raw_path.replace(".webm", ".wav")
+    subprocess.run(
+        ["ffmpeg", "-y", "-i", raw_path, "-ar", "16000", "-ac", "1", wav_path],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return wav_path
+
+
+def _transcribe_segments(wav_path):
+    """
+    Transcribe one Whisper window (up to 30 seconds) at a time.
+
+    Yields (start_seconds, text) as soon as each window is decoded so callers
+    can start downstream work while later windows are still being decoded.
+    Each window is batched with windows from other concurrent requests, and
+    the next window starts where the last complete segment ended.
+    """
+    audio = whisper.load_audio(wav_path)
+    start = 0
+
+    while start < len(audio):
+        text, consumed = batcher.transcribe(audio[start:start + whisper.audio.N_SAMPLES])
+        if text:
+            yield start / whisper.audio.SAMPLE_RATE, text
+        start += consumed
+
+
+def _submit_chunk(text):
+    """Analyze a chunk on the pipeline pool. The caller must already hold an "llm" slot."""
+    def task():
+        try:
+            return llm_service.analyze_chunk(text)
+        finally:
+            admission_controller.release("llm")
+
+    return pipeline_executor.submit(task)
+
+
+def _run_pipeline(wav_path):
+    """
+    Overlap transcription with analysis.
+
+    Once PIPELINE_CHUNK_CHARS of transcript are buffered, the whole buffer is
+    handed to the LLM pool while Whisper keeps decoding, provided this request
+    has fewer than PIPELINE_MAX_INFLIGHT chunks running and an "llm" slot is
+    free; otherwise text keeps accumulating and goes with the next chunk. At
+    most PIPELINE_MAX_CHUNKS chunks are summarized; text after that only feeds
+    topic extraction. Text still buffered when transcription ends goes into
+    the single condense call, so at most one LLM call starts after the last
+    window. Yields progress events, ending with a single "result" event.
+    """
+    segments = []
+    futures = []
+    buffer = ""
+
+    for start, text in _transcribe_segments(wav_path):
+        segments.append(text)
+        yield {"event": "segment", "start": start, "text": text}
+
+        buffer = f"{buffer} {text}".strip()
+        inflight = sum(1 for f in futures if not f.done())
+        if (len(buffer) >= PIPELINE_CHUNK_CHARS
+                and len(futures) < PIPELINE_MAX_CHUNKS
+                and inflight < PIPELINE_MAX_INFLIGHT
+                and admission_controller.try_acquire("llm")):
+            futures.append(_submit_chunk(buffer))
+            buffer = ""
+
+    transcript = " ".join(segments).strip()
+    logger.info(f"Transcription complete. Length: {len(transcript)} characters")
+
+    if len(transcript) < 50:
+        for future in futures:
+            # A task cancelled before it started never releases its slot
+            if future.cancel():
+                admission_controller.release("llm")
+        yield {"event": "result", "transcript": transcript, "analysis": None}
+        return
+
+    chunks = []
+    for index, future in enumerate(futures):
+        chunk = future.result()
+        chunks.append(chunk)
+        yield {"event": "chunk", "index": index, **chunk}
+
+    if buffer and len(futures) >= PIPELINE_MAX_CHUNKS:
+        logger.info(f"Chunk limit reached; last {len(buffer)} characters only feed topic extraction")
+        chunks.append(llm_service.analyze_chunk(buffer, summarize=False))
+        buffer = ""
+
+    # Several chunk summaries, or leftover text, take one LLM call to condense
+    if buffer or len(futures) > 1:
+        with admission_controller.operation("llm", timeout=PIPELINE_LLM_WAIT):
+            analysis = llm_service.merge_chunk_results(chunks, tail=buffer)
+    else:
+        analysis = llm_service.merge_chunk_results(chunks)
+    logger.info(f"Pipeline analysis complete. Topics found: {len(analysis['keyTopics'])}")
+
+    yield {"event": "result", "transcript": transcript, "analysis": analysis}
+
+
 @audio_bp.route("/upload", methods=["POST", "OPTIONS"])
 def upload_audio():
     if request.method == "OPTIONS":
         return "", 200
-    
+
     if "audio" not in request.files:
         return jsonify({"success": False, "error": "No audio file provided"}), 400
 
-    audio_file = request.files["audio"]
+    with admission_controller.operation("transcribe"):
+        try:
+            wav_path = _save_and_convert(request.files["audio"])
+        except Exception:
+            return jsonify({"success": False, "error": "FFmpeg conversion failed"}), 500
 
-    # Save raw file
-    raw_name = f"{uuid.uuid4().hex}.webm"
-    raw_path = os.path.join(UPLOAD_FOLDER, raw_name)
-    audio_file.save(raw_path)
+        # Whisper transcription
+        try:
+            logger.info(f"Starting transcription for {wav_path}")
+            transcript = " ".join(text for _, text in _transcribe_segments(wav_path)).strip()
+            logger.info(f"Transcription complete. Length: {len(transcript)} characters")
 
-    logger.info(f"Audio saved: {raw_path}")
+            if not transcript or len(transcript) == 0:
+                logger.warning("Empty transcript received from Whisper")
+                return jsonify({
+                    "success": False,
+                    "error": "No speech detected in the audio file. Please ensure the audio contains speech.",
+                    "transcript": ""
+                }), 400
 
-    # Convert to WAV
-    wav_path = raw_path.replace(".webm", ".wav")
+            if len(transcript) < 10:
+                logger.warning(f"Very short transcript: {transcript}")
 
-    try:
-        subprocess.run(
-            ["ffmpeg", "-y", "-i", raw_path, "-ar", "16000", "-ac", "1", wav_path],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-    except Exception:
-        return jsonify({"success": False, "error": "FFmpeg conversion failed"}), 500
-
-    # Whisper transcription
-    try:
-        logger.info(f"Starting transcription for {wav_path}")
-        result = model.transcribe(
-            wav_path,
-            task="translate",   # ANY language → English
-            language="en",
-            fp16=False
-        )
-
-        transcript = result["text"].strip()
-        logger.info(f"Transcription complete. Length: {len(transcript)} characters")
-        
-        if not transcript or len(transcript) == 0:
-            logger.warning("Empty transcript received from Whisper")
-            return jsonify({
-                "success": False,
-                "error": "No speech detected in the audio file. Please ensure the audio contains speech.",
-                "transcript": ""
-            }), 400
-        
-        if len(transcript) < 10:
-            logger.warning(f"Very short transcript: {transcript}")
-
-    except Exception as e:
-        logger.error(f"Transcription error: {str(e)}", exc_info=True)
-        return jsonify({"success": False, "error": f"Transcription failed: {str(e)}"}), 500
+        except Exception as e:
+            logger.error(f"Transcription error: {str(e)}", exc_info=True)
+            return jsonify({"success": False, "error": f"Transcription failed: {str(e)}"}), 500
 
     return jsonify({
         "success": True,
@@ -81,3 +191,84 @@ def upload_audio():
         "summary": transcript,
         "transcript_length": len(transcript)
     }), 200
+
+
+@audio_bp.route("/process", methods=["POST", "OPTIONS"])
+def process_audio():
+    """
+    Transcribe and analyze in one call.
+
+    Topic extraction and chunk summarization run while Whisper is still
+    decoding later segments. Pass ?stream=true for NDJSON progress events;
+    otherwise the combined transcript and analysis are returned as one JSON.
+    """
+    if request.method == "OPTIONS":
+        return "", 200
+
+    if "audio" not in request.files:
+        return jsonify({"success": False, "error": "No audio file provided"}), 400
+
+    # The streaming response holds the transcribe slot until the stream ends
+    admission_controller.acquire("transcribe")
+    streaming = False
+    try:
+        try:
+            wav_path = _save_and_convert(request.files["audio"])
+        except Exception:
+            return jsonify({"success": False, "error": "FFmpeg conversion failed"}), 500
+
+        logger.info(f"Starting pipelined transcription and analysis for {wav_path}")
+
+        if request.args.get("stream", "false").lower() == "true":
+            def generate():
+                try:
+                    for event in _run_pipeline(wav_path):
+                        yield json.dumps(event) + "\n"
+                except Exception as e:
+                    logger.error(f"Pipeline error: {str(e)}", exc_info=True)
+                    yield json.dumps({"event": "error", "error": f"Processing failed: {str(e)}"}) + "\n"
+
+            response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+            response.call_on_close(lambda: admission_controller.release("transcribe"))
+            streaming = True
+            return response
+
+        try:
+            result = None
+            for event in _run_pipeline(wav_path):
+                if event["event"] == "result":
+                    result = event
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            logger.error(f"Pipeline error: {str(e)}", exc_info=True)
+            return jsonify({"success": False, "error": f"Processing failed: {str(e)}"}), 500
+    finally:
+        if not streaming:
+            admission_controller.release("transcribe")
+
+    transcript = result["transcript"]
+    if not transcript:
+        logger.warning("Empty transcript received from Whisper")
+        return jsonify({
+            "success": False,
+            "error": "No speech detected in the audio file. Please ensure the audio contains speech.",
+            "transcript": ""
+        }), 400
+
+    if result["analysis"] is None:
+        logger.warning(f"Transcript too short for analysis: {len(transcript)} characters")
+        return jsonify({
+            "success": False,
+            "error": f"Transcript must be at least 50 characters for analysis (received {len(transcript)})",
+            "transcript": transcript,
+            "transcript_length": len(transcript)
+        }), 400
+
+    return jsonify({
+        "success": True,
+        "language": "English",
+        "transcript": transcript,
+        "transcript_length": len(transcript),
+        "analysis": result["analysis"]
+    }), 200
@@ -0,0 +1,70 @@
+from flask import Blueprint, request, send_file, Response
+from services.pdf_service import PDFService
+from services.export_service import RENDERERS
+from services.layout import validate_analysis
+from services.admission import admission_controller, AdmissionRejected
+from werkzeug.exceptions import RequestEntityTooLarge
+from itertools import chain
+import logging
+
+logger = logging.getLogger(__name__)
+export_bp = Blueprint('export', __name__)
+pdf_service = PDFService()
+
+@export_bp.route('/export/<fmt>', methods=['POST', 'OPTIONS'])
+def export(fmt):
+    """Export analysis results as pdf, markdown, html, opml or json"""
+    
+    if request.method == 'OPTIONS':
+        return '', 200
+    
+    if fmt != 'pdf' and fmt not in RENDERERS:
+        return {'error': f'Unsupported export format: {fmt}',
+                'formats': ['pdf', *RENDERERS]}, 400
+    
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return {'error': 'No JSON data provided'}, 400
+        
+        # Validate required fields
+        if 'summary' not in data and 'topicTree' not in data:
+            return {'error': 'Missing required fields: summary or topicTree'}, 400
+        
+        # Text formats stream after the 200 is sent, so reject bad field types up front
+        error = validate_analysis(data)
+        if error:
+            return {'error': f'Invalid analysis data: {error}'}, 400
+        
+        logger.info(f'Exporting analysis data as {fmt}')
+        
+        if fmt == 'pdf':
+            with admission_controller.operation('pdf'):
+                pdf_buffer = pdf_service.generate_pdf(data)
+            
+            return send_file(
+                pdf_buffer,
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name='learning_map_analysis.pdf'
+            )
+        
+        # Text formats are streamed block by block as they are rendered;
+        # the first chunk is produced here so a failure still returns a 500
+        renderer = RENDERERS[fmt]
+        filename = f'learning_map_analysis.{renderer.extension}'
+        chunks = renderer.render(data)
+        first_chunk = next(chunks, '')
+        
+        return Response(
+            chain([first_chunk], chunks),
+            mimetype=renderer.mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+        
+    except (AdmissionRejected, RequestEntityTooLarge):
+        raise
+    except Exception as e:
+        logger.error(f'Error exporting {fmt}: {str(e)}', exc_info=True)
+        return {'error': f'Failed to export {fmt}: {str(e)}'}, 500
@@ -0,0 +1,106 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request or operation would exceed the configured budget."""
+
+    def __init__(self, message: str, retry_after: int = 5):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Global admission control:
+    - caps the total bytes of request bodies being processed at once
+    - caps concurrent expensive operations (transcribe, llm, pdf)
+    Rejects immediately by default so workers never pile up work; internal
+    callers that must finish a job can wait a bounded time for a slot.
+    """
+
+    def __init__(self):
+        self.max_inflight_bytes = int(os.getenv('ADMISSION_MAX_INFLIGHT_BYTES', 256 * 1024 * 1024))
+        self.operation_limits = {
+            'transcribe': int(os.getenv('ADMISSION_MAX_TRANSCRIBE', 4)),
+            'llm': int(os.getenv('ADMISSION_MAX_LLM', 4)),
+            'pdf': int(os.getenv('ADMISSION_MAX_PDF', 4))
+        }
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._inflight_bytes = 0
+        self._inflight_requests = 0
+        self._active = {kind: 0 for kind in self.operation_limits}
+        self._rejected = {'bytes': 0, **{kind: 0 for kind in self.operation_limits}}
+
+    # -----------------------------
+    # REQUEST BODY BYTES
+    # -----------------------------
+    def admit_bytes(self, nbytes: int):
+        with self._lock:
+            if self._inflight_bytes + nbytes > self.max_inflight_bytes:
+                self._rejected['bytes'] += 1
+                raise AdmissionRejected('Server is busy processing other uploads. Please retry shortly.')
+            self._inflight_bytes += nbytes
+            self._inflight_requests += 1
+
+    def release_bytes(self, nbytes: int):
+        with self._lock:
+            self._inflight_bytes -= nbytes
+            self._inflight_requests -= 1
+
+    # -----------------------------
+    # EXPENSIVE OPERATIONS
+    # -----------------------------
+    def acquire(self, kind: str, timeout: float = 0):
+        """Take a slot for `kind`, waiting up to `timeout` seconds for one to free up."""
+        with self._released:
+            limit = self.operation_limits[kind]
+            if not self._released.wait_for(lambda: self._active[kind] < limit, timeout=timeout):
+                self._rejected[kind] += 1
+                raise AdmissionRejected(f'Too many concurrent {kind} operations. Please retry shortly.')
+            self._active[kind] += 1
+
+    def try_acquire(self, kind: str) -> bool:
+        """Take a slot for `kind` if one is free. Not counted as a rejection."""
+        with self._lock:
+            if self._active[kind] >= self.operation_limits[kind]:
+                return False
+            self._active[kind] += 1
+            return True
+
+    def release(self, kind: str):
+        with self._released:
+            self._active[kind] -= 1
+            self._released.notify_all()
+
+    @contextmanager
+    def operation(self, kind: str, timeout: float = 0):
+        self.acquire(kind, timeout)
+        try:
+            yield
+        finally:
+            self.release(kind)
+
+    # -----------------------------
+    # REPORTING
+    # -----------------------------
+    def usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'inflightBytes': self._inflight_bytes,
+                'maxInflightBytes': self.max_inflight_bytes,
+                'inflightRequests': self._inflight_requests,
+                'operations': {
+                    kind: {'active': self._active[kind], 'limit': limit}
+                    for kind, limit in self.operation_limits.items()
+                },
+                'rejected': dict(self._rejected)
+            }
+
+
+# Shared by every route so limits apply across the whole worker process
+admission_controller = AdmissionController()
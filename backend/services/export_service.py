@@ -0,0 +1,147 @@
+import json
+from html import escape
+from xml.sax.saxutils import quoteattr
+from typing import Dict, Any, Iterator
+from services.layout import iter_layout
+
+
+class Renderer:
+    """
+    Streaming exporter built on the shared layout.
+    render() yields text chunks as each layout block is produced.
+    """
+
+    mimetype = 'text/plain'
+    extension = 'txt'
+
+    def render(self, analysis_data: Dict[str, Any]) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class MarkdownRenderer(Renderer):
+    mimetype = 'text/markdown'
+    extension = 'md'
+
+    def render(self, analysis_data: Dict[str, Any]) -> Iterator[str]:
+        for block in iter_layout(analysis_data):
+            if block.kind == 'title':
+                yield f"# {block.text}\n"
+            elif block.kind == 'section':
+                yield f"\n## {block.text}\n\n"
+            elif block.kind == 'paragraph':
+                yield f"{block.text}\n"
+            elif block.kind == 'bullet':
+                yield f"- {block.text}\n"
+            elif block.kind == 'node':
+                yield f"{'  ' * block.level}- {block.text}\n"
+
+
+class HTMLRenderer(Renderer):
+    mimetype = 'text/html'
+    extension = 'html'
+
+    # Mirrors the PDFService styles
+    STYLE = (
+        "body { font-family: Helvetica, Arial, sans-serif; max-width: 800px; margin: 72px auto; color: #34495e; }\n"
+        "h1 { font-size: 24px; color: #1a1a1a; text-align: center; margin-bottom: 30px; }\n"
+        "h2 { font-size: 18px; color: #2c3e50; margin: 20px 0 12px; }\n"
+        ".summary { font-size: 12px; color: #555555; line-height: 16px; }\n"
+        ".topic { font-size: 12px; margin: 0 0 8px 20px; }\n"
+        ".node { margin: 4px 0; }\n"
+        ".node.level-0 { font-size: 14px; font-weight: bold; color: #2c3e50; margin-top: 10px; }\n"
+        ".node.level-1 { font-size: 12px; }\n"
+        ".node.level-deep { font-size: 11px; color: #555555; }\n"
+    )
+
+    def render(self, analysis_data: Dict[str, Any]) -> Iterator[str]:
+        for block in iter_layout(analysis_data):
+            text = escape(block.text)
+
+            if block.kind == 'title':
+                yield (
+                    "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                    f"<title>{text}</title>\n<style>\n{self.STYLE}</style>\n</head>\n<body>\n"
+                    f"<h1>{text}</h1>\n"
+                )
+            elif block.kind == 'section':
+                yield f"<h2>{text}</h2>\n"
+            elif block.kind == 'paragraph':
+                yield f"<p class=\"summary\">{text}</p>\n"
+            elif block.kind == 'bullet':
+                yield f"<p class=\"topic\">• {text}</p>\n"
+            elif block.kind == 'node':
+                level_class = f"level-{block.level}" if block.level < 2 else "level-deep"
+                prefix = "• " if block.level > 0 else ""
+                yield (
+                    f"<p class=\"node {level_class}\" style=\"margin-left: {block.level * 30}px\">"
+                    f"{prefix}{text}</p>\n"
+                )
+
+        yield "</body>\n</html>\n"
+
+
+class OPMLRenderer(Renderer):
+    """Mind-map outline; each block nests under the closest shallower block."""
+
+    mimetype = 'text/x-opml'
+    extension = 'opml'
+
+    def render(self, analysis_data: Dict[str, Any]) -> Iterator[str]:
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n<opml version="2.0">\n'
+
+        open_depths = []
+        for block in iter_layout(analysis_data):
+            if block.kind == 'title':
+                yield f"<head>\n  <title>{escape(block.text)}</title>\n</head>\n<body>\n"
+
+            while open_depths and open_depths[-1] >= block.depth:
+                open_depths.pop()
+                yield f"{'  ' * (len(open_depths) + 1)}</outline>\n"
+
+            yield f"{'  ' * (len(open_depths) + 1)}<outline text={quoteattr(block.text)}>\n"
+            open_depths.append(block.depth)
+
+        while open_depths:
+            open_depths.pop()
+            yield f"{'  ' * (len(open_depths) + 1)}</outline>\n"
+
+        yield "</body>\n</opml>\n"
+
+
+class JSONMindMapRenderer(Renderer):
+    """Mind-map as nested {"label", "children"} nodes, same nesting as OPML."""
+
+    mimetype = 'application/json'
+    extension = 'json'
+
+    def render(self, analysis_data: Dict[str, Any]) -> Iterator[str]:
+        # [depth, has_children] for each node whose children list is still open
+        open_nodes = []
+
+        for block in iter_layout(analysis_data):
+            while open_nodes and open_nodes[-1][0] >= block.depth:
+                open_nodes.pop()
+                yield "]}"
+
+            if open_nodes:
+                if open_nodes[-1][1]:
+                    yield ", "
+                open_nodes[-1][1] = True
+
+            yield f'{{"label": {json.dumps(block.text, ensure_ascii=False)}, "children": ['
+            open_nodes.append([block.depth, False])
+
+        while open_nodes:
+            open_nodes.pop()
+            yield "]}"
+
+        yield "\n"
+
+
+# Text formats; PDF goes through PDFService
+RENDERERS = {
+    'markdown': MarkdownRenderer(),
+    'html': HTMLRenderer(),
+    'opml': OPMLRenderer(),
+    'json': JSONMindMapRenderer()
+}
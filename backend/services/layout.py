@@ -0,0 +1,92 @@
+from typing import Dict, Any, Iterator, NamedTuple, Optional
+
+# Deeper topic trees are rejected; layout recursion follows tree depth
+MAX_TREE_DEPTH = 50
+
+
+class Block(NamedTuple):
+    """
+    One element of the export layout.
+
+    kind:  'title', 'section', 'paragraph', 'bullet' or 'node'
+    depth: position in the outline (title 0, sections 1, section content 2+)
+    level: nesting level inside the topic tree (only used by 'node')
+    """
+    kind: str
+    text: str
+    depth: int
+    level: int = 0
+
+
+def iter_layout(analysis_data: Dict[str, Any]) -> Iterator[Block]:
+    """
+    Yield the layout shared by every export format, in document order.
+
+    Args:
+        analysis_data: Dictionary containing summary, keyTopics, and topicTree
+    """
+    yield Block('title', 'Learning Map Analysis', 0)
+
+    summary = analysis_data.get('summary')
+    yield Block('section', 'Summary', 1)
+    yield Block('paragraph', 'No summary available.' if summary is None else summary, 2)
+
+    key_topics = analysis_data.get('keyTopics') or []
+    if key_topics:
+        yield Block('section', 'Key Topics', 1)
+        for topic in key_topics:
+            yield Block('bullet', topic, 2)
+
+    topic_tree = analysis_data.get('topicTree') or []
+    if topic_tree:
+        yield Block('section', 'Topic Tree', 1)
+        for node in topic_tree:
+            yield from _iter_tree(node, 0)
+
+
+def _iter_tree(node: Dict[str, Any], level: int) -> Iterator[Block]:
+    yield Block('node', node.get('label') or '', 2 + level, level)
+    for child in node.get('children') or []:
+        yield from _iter_tree(child, level + 1)
+
+
+def validate_analysis(analysis_data: Any) -> Optional[str]:
+    """
+    Check that analysis data can be laid out before any output is produced.
+    Missing or null fields are allowed. Returns an error message, or None.
+    """
+    if not isinstance(analysis_data, dict):
+        return 'Analysis data must be a JSON object'
+
+    summary = analysis_data.get('summary')
+    if summary is not None and not isinstance(summary, str):
+        return 'summary must be a string'
+
+    key_topics = analysis_data.get('keyTopics')
+    if key_topics is not None and not (
+            isinstance(key_topics, list) and all(isinstance(t, str) for t in key_topics)):
+        return 'keyTopics must be a list of strings'
+
+    topic_tree = analysis_data.get('topicTree')
+    if topic_tree is None:
+        return None
+    if not isinstance(topic_tree, list):
+        return 'topicTree must be a list of nodes'
+
+    pending = [(node, 0) for node in topic_tree]
+    while pending:
+        node, level = pending.pop()
+        if not isinstance(node, dict):
+            return 'topicTree nodes must be objects'
+        if node.get('label') is not None and not isinstance(node['label'], str):
+            return 'topicTree node labels must be strings'
+        if level >= MAX_TREE_DEPTH:
+            return f'topicTree is nested deeper than {MAX_TREE_DEPTH} levels'
+
+        children = node.get('children')
+        if children is not None:
+            if not isinstance(children, list):
+                return 'topicTree node children must be a list'
+            pending.extend((child, level + 1) for child in children)
+
+    return None
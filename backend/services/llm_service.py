@@ -2,7 +2,7 @@ import requests
 import json
 import os
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class LLMService:
@@ -31,6 +31,49 @@ class LLMService:
             "topicTree": topic_tree
         }
 
+    # -----------------------------
+    # CHUNKED ANALYSIS (PIPELINE)
+    # -----------------------------
+    def analyze_chunk(self, content: str, summarize: bool = True) -> Dict[str, Any]:
+        """
+        Analyze one transcript chunk:
+        - LLM summarizes the whole chunk (skipped if summarize=False)
+        - Python extracts topics from the whole chunk
+        """
+
+        return {
+            "summary": self._generate_summary(content) if summarize else "",
+            "keyTopics": self._extract_topics(content)
+        }
+
+    def merge_chunk_results(self, chunks: List[Dict[str, Any]], tail: str = "") -> Dict[str, Any]:
+        """
+        Combine per-chunk results into the analyze_content() shape.
+        tail is transcript text that was never sent as a chunk. With more than
+        one chunk summary, or any tail, one LLM call condenses them together.
+        """
+
+        summaries = [c["summary"] for c in chunks if c.get("summary")]
+        if tail:
+            summaries.append(tail)
+            chunks = [*chunks, {"keyTopics": self._extract_topics(tail)}]
+
+        if len(summaries) > 1 or tail:
+            summary = self._generate_summary(" ".join(summaries))
+        else:
+            summary = summaries[0] if summaries else ""
+
+        topics = []
+        for chunk in chunks:
+            topics.extend(t for t in chunk.get("keyTopics", []) if t != "Main Concept")
+        topics = list(dict.fromkeys(topics))[:6] or ["Main Concept"]
+
+        return {
+            "summary": summary,
+            "keyTopics": topics,
+            "topicTree": self._build_topic_tree(topics)
+        }
+
     # -----------------------------
     # LLM SUMMARY
     # -----------------------------
@@ -5,7 +5,9 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.pdfgen import canvas
 from io import BytesIO
+from xml.sax.saxutils import escape
 from typing import Dict, Any, List
+from services.layout import iter_layout
 
 class PDFService:
     def __init__(self):
@@ -79,62 +81,48 @@ class PDFService:
                                 rightMargin=72, leftMargin=72,
                                 topMargin=72, bottomMargin=72)
         
-        story = []
-        
-        # Title
-        title = Paragraph("Learning Map Analysis", self.styles['CustomTitle'])
-        story.append(title)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Summary Section
-        summary_title = Paragraph("Summary", self.styles['SectionTitle'])
-        story.append(summary_title)
-        
-        summary_text = analysis_data.get('summary', 'No summary available.')
-        summary_para = Paragraph(summary_text, self.styles['SummaryStyle'])
-        story.append(summary_para)
-        story.append(Spacer(1, 0.2*inch))
+        doc.build(self._build_story(analysis_data))
+        buffer.seek(0)
         
-        # Key Topics Section
-        key_topics = analysis_data.get('keyTopics', [])
-        if key_topics:
-            topics_title = Paragraph("Key Topics", self.styles['SectionTitle'])
-            story.append(topics_title)
-            
-            for topic in key_topics:
-                topic_para = Paragraph(f"• {topic}", self.styles['TopicStyle'])
-                story.append(topic_para)
-            
-            story.append(Spacer(1, 0.2*inch))
+        return buffer
+    
+    def _build_story(self, analysis_data: Dict[str, Any]) -> List:
+        """Lay out the PDF flowables from the shared export layout."""
+        story = []
         
-        # Topic Tree Section
-        topic_tree = analysis_data.get('topicTree', [])
-        if topic_tree:
-            tree_title = Paragraph("Topic Tree", self.styles['SectionTitle'])
-            story.append(tree_title)
-            
-            for node in topic_tree:
-                self._add_tree_node(story, node, 0)
+        for block in iter_layout(analysis_data):
+            # Paragraph parses its text as markup
+            text = escape(block.text)
             
-            story.append(Spacer(1, 0.2*inch))
+            if block.kind == 'title':
+                story.append(Paragraph(text, self.styles['CustomTitle']))
+                story.append(Spacer(1, 0.3*inch))
+            elif block.kind == 'section':
+                # Close the previous section
+                if not isinstance(story[-1], Spacer):
+                    story.append(Spacer(1, 0.2*inch))
+                story.append(Paragraph(text, self.styles['SectionTitle']))
+            elif block.kind == 'paragraph':
+                story.append(Paragraph(text, self.styles['SummaryStyle']))
+            elif block.kind == 'bullet':
+                story.append(Paragraph(f"• {text}", self.styles['TopicStyle']))
+            elif block.kind == 'node':
+                self._add_tree_node(story, text, block.level)
         
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
+        story.append(Spacer(1, 0.2*inch))
         
-        return buffer
+        return story
     
-    def _add_tree_node(self, story: List, node: Dict[str, Any], level: int):
+    def _add_tree_node(self, story: List, label: str, level: int):
         """
-        Recursively add tree nodes to PDF story.
+        Add one tree node to the PDF story.
         
         Args:
             story: List to append story elements to
-            node: Node dictionary with id, label, and optional children
+            label: Node label
             level: Current nesting level (for indentation)
         """
         indent = level * 20
-        label = node.get('label', '')
         
         # Create indentation style based on level
         if level == 0:
@@ -175,8 +163,3 @@ class PDFService:
         prefix = "• " if level > 0 else ""
         node_para = Paragraph(f"{prefix}{label}", node_style)
         story.append(node_para)
-        
-        # Recursively add children
-        children = node.get('children', [])
-        for child in children:
-            self._add_tree_node(story, child, level + 1)
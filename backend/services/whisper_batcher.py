@@ -0,0 +1,199 @@
+import os
+import time
+import queue
+import logging
+import threading
+from typing import NamedTuple
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import torch
+import whisper
+
+logger = logging.getLogger(__name__)
+
+
+class _Window(NamedTuple):
+    mel: torch.Tensor
+    future: Future
+    decoding: threading.Event  # set once the worker starts decoding this window
+
+
+class WhisperBatcher:
+    """
+    Micro-batching scheduler in front of a shared Whisper model:
+    - request threads compute the 30-second log-mel window themselves
+    - a single worker collects windows for up to WHISPER_BATCH_WINDOW_MS
+      (or WHISPER_MAX_BATCH windows) and decodes them in one forward pass
+    - each result is routed back to the waiting request through a Future
+
+    Per window it keeps what model.transcribe() does: windows that look like
+    repetition loops or low-confidence output are re-decoded at higher
+    temperatures, and the caller resumes from the last complete segment's
+    timestamp instead of a fixed 30-second boundary. Previous-text prompting
+    is not applied, since a batch shares one set of decoding options.
+    """
+
+    # Same thresholds and temperature schedule as model.transcribe()
+    NO_SPEECH_THRESHOLD = 0.6
+    LOGPROB_THRESHOLD = -1.0
+    COMPRESSION_RATIO_THRESHOLD = 2.4
+    FALLBACK_TEMPERATURES = (0.2, 0.4, 0.6, 0.8, 1.0)
+
+    def __init__(self, model):
+        self.model = model
+        self.max_batch_size = int(os.getenv('WHISPER_MAX_BATCH', 4))
+        self.batch_window = int(os.getenv('WHISPER_BATCH_WINDOW_MS', 50)) / 1000
+        # How long a request waits once its batch has started decoding
+        self.decode_timeout = float(os.getenv('WHISPER_DECODE_TIMEOUT', 120))
+
+        self.decode_options = dict(
+            task="translate",   # ANY language → English
+            language="en",
+            fp16=False
+        )
+        self.options = whisper.DecodingOptions(**self.decode_options)
+        self.tokenizer = whisper.tokenizer.get_tokenizer(
+            model.is_multilingual,
+            num_languages=model.num_languages,
+            language="en",
+            task="translate"
+        )
+        # Audio samples per output timestamp step (0.02 s)
+        self.samples_per_timestamp = (
+            whisper.audio.N_FRAMES // model.dims.n_audio_ctx * whisper.audio.HOP_LENGTH
+        )
+
+        # whisper.decode installs kv-cache hooks on the model, so two decodes must
+        # never run at once; held for one batch or one fallback window at a time
+        self.model_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='whisper-batcher', daemon=True)
+        self._worker.start()
+
+    def transcribe(self, audio):
+        """
+        Transcribe up to 30 seconds of 16 kHz audio. Blocks until the batch is decoded.
+
+        Returns (text, consumed_samples); the caller continues from
+        audio[consumed_samples:] so a cut-off final segment is decoded again.
+        """
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(audio),
+            n_mels=self.model.dims.n_mels
+        )
+        window = self._submit(mel)
+        # Time spent queued behind other batches does not count against the timeout
+        window.decoding.wait()
+        try:
+            result = window.future.result(timeout=self.decode_timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(
+                f"Whisper decode did not finish within {self.decode_timeout:g} seconds"
+            ) from None
+        result = self._with_fallback(mel, result)
+
+        if self._is_silence(result):
+            return "", len(audio)
+        return self._split_result(result, len(audio))
+
+    def _submit(self, mel) -> _Window:
+        window = _Window(mel, Future(), threading.Event())
+        self._queue.put(window)
+        return window
+
+    # -----------------------------
+    # WORKER
+    # -----------------------------
+    def _collect(self):
+        batch = []
+        deadline = None
+
+        while len(batch) < self.max_batch_size:
+            if deadline is None:
+                window = self._queue.get()
+                deadline = time.monotonic() + self.batch_window
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    window = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            batch.append(window)
+
+        return batch
+
+    def _decode_batch(self, mels):
+        batch = torch.stack(mels).to(self.model.device)
+        return whisper.decode(self.model, batch, self.options)
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch = self._collect()
+                if not batch:
+                    continue
+
+                with self.model_lock:
+                    for window in batch:
+                        window.decoding.set()
+                    results = self._decode_batch([window.mel for window in batch])
+                logger.debug(f"Decoded Whisper batch of {len(batch)} windows")
+
+                for window, result in zip(batch, results):
+                    window.future.set_result(result)
+            except Exception as e:
+                logger.error(f"Batched Whisper decode failed: {str(e)}", exc_info=True)
+                error = e
+            else:
+                error = RuntimeError("Whisper batch returned fewer results than windows")
+
+            # Never leave a waiting request hanging
+            for window in batch:
+                if not window.future.done():
+                    window.future.set_exception(error)
+                window.decoding.set()
+
+    # -----------------------------
+    # RESULT HANDLING
+    # -----------------------------
+    def _needs_fallback(self, result) -> bool:
+        if self._is_silence(result):
+            return False
+        return (result.compression_ratio > self.COMPRESSION_RATIO_THRESHOLD
+                or result.avg_logprob < self.LOGPROB_THRESHOLD)
+
+    def _is_silence(self, result) -> bool:
+        return result.no_speech_prob > self.NO_SPEECH_THRESHOLD and result.avg_logprob < self.LOGPROB_THRESHOLD
+
+    def _with_fallback(self, mel, result):
+        """Re-decode a failed window alone at increasing temperatures."""
+        for temperature in self.FALLBACK_TEMPERATURES:
+            if not self._needs_fallback(result):
+                break
+            options = whisper.DecodingOptions(**self.decode_options, temperature=temperature, best_of=5)
+            with self.model_lock:
+                result = whisper.decode(self.model, mel.to(self.model.device), options)
+        return result
+
+    def _split_result(self, result, num_samples):
+        """Keep complete timestamped segments and report how far the window was consumed."""
+        tokens = result.tokens
+        timestamp_begin = self.tokenizer.timestamp_begin
+        is_timestamp = [t >= timestamp_begin for t in tokens]
+        single_timestamp_ending = is_timestamp[-2:] == [False, True]
+        consecutive = [i + 1 for i in range(len(tokens) - 1) if is_timestamp[i] and is_timestamp[i + 1]]
+
+        consumed = num_samples
+        if consecutive and not single_timestamp_ending:
+            # Drop the unfinished last segment and resume from its start
+            last_slice = consecutive[-1]
+            tokens = tokens[:last_slice]
+            last_timestamp_pos = tokens[-1] - timestamp_begin
+            consumed = min(last_timestamp_pos * self.samples_per_timestamp, num_samples) or num_samples
+
+        text = self.tokenizer.decode([t for t in tokens if t < self.tokenizer.eot]).strip()
+        return text, consumed
@@ -7,6 +7,8 @@ Run this after starting the Flask backend: python test_endpoints.py
 import requests
 import json
 import sys
+import glob
+import os
 
 BASE_URL = "http://localhost:5000/api"
 
@@ -81,6 +83,130 @@ def test_analyze():
         print(f"✗ Analysis error: {e}")
         return False
 
+def test_admission():
+    """Test admission usage reporting and request size limits"""
+    print("\nTesting /api/admission and request limits...")
+    try:
+        response = requests.get(f"{BASE_URL}/admission", timeout=5)
+        if response.status_code != 200 or "inflightBytes" not in response.json():
+            print(f"✗ Admission usage failed: Status {response.status_code}")
+            return False
+        usage = response.json()
+        print(f"✓ Admission usage: {usage['inflightBytes']} bytes in flight, "
+              f"{usage['inflightRequests']} requests")
+        
+        # Larger than the default 1 MB analyze limit
+        response = requests.post(
+            f"{BASE_URL}/analyze",
+            data=b"x" * (2 * 1024 * 1024),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
+        if response.status_code != 413:
+            print(f"✗ Oversized body not rejected: Status {response.status_code}")
+            return False
+        print(f"✓ Oversized body rejected with 413 (max_bytes: {response.json().get('max_bytes')})")
+        
+        # Chunked body without Content-Length
+        response = requests.post(
+            f"{BASE_URL}/analyze",
+            data=iter([b'{"content": "chunked"}']),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        )
+        if response.status_code != 411:
+            print(f"✗ Chunked body not rejected: Status {response.status_code}")
+            return False
+        print("✓ Chunked body rejected with 411")
+        return True
+    except requests.exceptions.ConnectionError:
+        print("✗ Cannot connect to Flask backend.")
+        return False
+    except Exception as e:
+        print(f"✗ Admission test error: {e}")
+        return False
+
+def test_audio_process():
+    """Test pipelined transcription + analysis with a sample recording"""
+    print("\nTesting /api/audio/process endpoint...")
+    samples = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads", "*.wav")))
+    if not samples:
+        print("⚠ No sample .wav files in uploads/ - skipping")
+        return True
+    
+    try:
+        print(f"  Sending {os.path.basename(samples[0])} (streaming)...")
+        with open(samples[0], "rb") as f:
+            response = requests.post(
+                f"{BASE_URL}/audio/process?stream=true",
+                files={"audio": f},
+                stream=True,
+                timeout=600  # Transcription + LLM processing can take time
+            )
+        
+        if response.status_code != 200:
+            print(f"✗ Audio processing failed: Status {response.status_code}")
+            print(f"  Response: {response.text[:200]}")
+            return False
+        
+        events = [json.loads(line) for line in response.iter_lines() if line]
+        kinds = [e.get("event") for e in events]
+        if not events or kinds[-1] not in ("result", "error"):
+            print(f"✗ Stream did not end with a result: {kinds}")
+            return False
+        if kinds[-1] == "error":
+            print(f"✗ Pipeline reported an error: {events[-1].get('error')}")
+            return False
+        
+        result = events[-1]
+        print(f"✓ Audio processed: {kinds.count('segment')} segments, {kinds.count('chunk')} chunks")
+        print(f"  Transcript: {result['transcript'][:100]}...")
+        if result.get("analysis"):
+            print(f"  Key Topics: {len(result['analysis'].get('keyTopics', []))} topics found")
+        else:
+            print("  Transcript too short for analysis")
+        return True
+    except requests.exceptions.ConnectionError:
+        print("✗ Cannot connect to Flask backend.")
+        return False
+    except Exception as e:
+        print(f"✗ Audio processing error: {e}")
+        return False
+
+def test_export():
+    """Test every export format and the type check that runs before streaming"""
+    print("\nTesting /api/export/<format> endpoint...")
+    analysis = {
+        "summary": "Newton's laws describe how forces change motion.",
+        "keyTopics": ["Inertia", "Force"],
+        "topicTree": [{"id": "1", "label": "Learning Topics", "children": [
+            {"id": "1-1", "label": "Inertia"}, {"id": "1-2", "label": "Force"}
+        ]}]
+    }
+    
+    try:
+        for fmt in ("pdf", "markdown", "html", "opml", "json"):
+            response = requests.post(f"{BASE_URL}/export/{fmt}", json=analysis, timeout=30)
+            if response.status_code != 200 or "attachment" not in response.headers.get("Content-Disposition", ""):
+                print(f"✗ {fmt} export failed: Status {response.status_code}")
+                return False
+            if fmt == "json":
+                json.loads(response.text)
+            print(f"✓ {fmt} export: {len(response.content)} bytes")
+        
+        response = requests.post(f"{BASE_URL}/export/markdown", json={"summary": None, "topicTree": ["x"]}, timeout=30)
+        if response.status_code != 400:
+            print(f"✗ Invalid topic tree not rejected: Status {response.status_code}")
+            return False
+        print(f"✓ Invalid topic tree rejected with 400 ({response.json().get('error')})")
+        return True
+    except requests.exceptions.ConnectionError:
+        print("✗ Cannot connect to Flask backend.")
+        return False
+    except Exception as e:
+        print(f"✗ Export test error: {e}")
+        return False
+
 def main():
     print("=" * 60)
     print("Flask Backend Endpoint Tests")
@@ -95,9 +221,16 @@ def main():
         sys.exit(1)
     
     analyze_ok = test_analyze()
+    audio_ok = test_audio_process()
+    admission_ok = test_admission()
+    export_ok = test_export()
     
     print("\n" + "=" * 60)
-    if health_ok and analyze_ok:
+    if not (audio_ok and admission_ok and export_ok):
+        print("✗ Some tests failed.")
+        print("=" * 60)
+        return 1
+    elif health_ok and analyze_ok:
         print("✓ All tests passed! Flask backend is working correctly.")
         print("=" * 60)
         return 0
@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+"""
+Offline checks for backend service logic (no Flask server, Ollama or Whisper model needed).
+Run from the backend directory: python test_services.py
+"""
+
+import sys
+import json
+import logging
+import threading
+import time
+
+from services.llm_service import LLMService
+from services.admission import AdmissionController, AdmissionRejected
+from services.layout import iter_layout, validate_analysis
+from services.export_service import RENDERERS
+
+
+def check(name, condition, detail=""):
+    if condition:
+        print(f"✓ {name}")
+    else:
+        print(f"✗ {name}" + (f": {detail}" if detail else ""))
+    return bool(condition)
+
+
+def test_merge_chunk_results():
+    """Test combining pipeline chunk results"""
+    print("Testing LLMService.merge_chunk_results...")
+    llm_service = LLMService()
+    calls = []
+
+    def fake_summary(content):
+        calls.append(content)
+        return "Condensed."
+
+    llm_service._generate_summary = fake_summary
+    ok = True
+
+    single = llm_service.merge_chunk_results([
+        {"summary": "Only chunk.", "keyTopics": ["Inertia", "Main Concept"]}
+    ])
+    ok &= check("single chunk keeps its summary without an LLM call",
+                single["summary"] == "Only chunk." and not calls, single)
+    ok &= check("placeholder topic dropped when real topics exist",
+                single["keyTopics"] == ["Inertia"], single["keyTopics"])
+
+    merged = llm_service.merge_chunk_results([
+        {"summary": "First.", "keyTopics": ["Inertia", "Force"]},
+        {"summary": "Second.", "keyTopics": ["Force", "Momentum"]},
+        {"summary": "", "keyTopics": ["Energy"]}
+    ])
+    ok &= check("several summaries are condensed with one LLM call",
+                merged["summary"] == "Condensed." and calls == ["First. Second."], calls)
+    ok &= check("topics deduplicated in order",
+                merged["keyTopics"] == ["Inertia", "Force", "Momentum", "Energy"], merged["keyTopics"])
+    ok &= check("topic tree built from merged topics",
+                [c["label"] for c in merged["topicTree"][0]["children"]] == merged["keyTopics"])
+
+    many = llm_service.merge_chunk_results([
+        {"summary": "", "keyTopics": [f"Topic {i}"]} for i in range(10)
+    ])
+    ok &= check("at most 6 topics", len(many["keyTopics"]) == 6, many["keyTopics"])
+
+    calls.clear()
+    tailed = llm_service.merge_chunk_results(
+        [{"summary": "First.", "keyTopics": ["Inertia"]}], tail="Momentum: mass times velocity.")
+    ok &= check("leftover text condensed with the chunk summaries in one call",
+                tailed["summary"] == "Condensed." and calls == ["First. Momentum: mass times velocity."], calls)
+    ok &= check("leftover text feeds topics", "Momentum" in tailed["keyTopics"], tailed["keyTopics"])
+
+    empty = llm_service.merge_chunk_results([{"summary": "", "keyTopics": ["Main Concept"]}])
+    ok &= check("falls back to Main Concept", empty["keyTopics"] == ["Main Concept"], empty)
+
+    chunk = LLMService().analyze_chunk("Inertia: objects keep moving. " * 100, summarize=False)
+    ok &= check("analyze_chunk(summarize=False) skips the summary",
+                chunk["summary"] == "" and "Inertia" in chunk["keyTopics"], chunk)
+
+    return ok
+
+
+def test_pipeline():
+    """Test that every transcript segment reaches the LLM and the tail costs one call"""
+    print("\nTesting the /api/audio/process pipeline...")
+    try:
+        import whisper
+        from types import SimpleNamespace
+    except ImportError as e:
+        print(f"⚠ Skipping: {e}")
+        return True
+
+    # routes.audio loads the Whisper model at import; only the batcher reads it here
+    model = SimpleNamespace(is_multilingual=True, num_languages=99, device="cpu",
+                            dims=SimpleNamespace(n_mels=80, n_audio_ctx=1500))
+    load_model = whisper.load_model
+    whisper.load_model = lambda name: model
+    try:
+        from routes import audio
+    finally:
+        whisper.load_model = load_model
+
+    segments = [f"Segment{i} " + "words " * 65 for i in range(15)]  # about 6,000 characters
+    prompts = []
+
+    def fake_segments(wav_path):
+        for i, text in enumerate(segments):
+            time.sleep(0.05)  # decoding one window
+            yield i * 30.0, text.strip()
+
+    def fake_summary(content):
+        prompts.append((time.monotonic(), content))
+        time.sleep(0.2)  # one LLM call, slower than a window
+        return "Summary."
+
+    transcribe_segments = audio._transcribe_segments
+    audio._transcribe_segments = fake_segments
+    audio.llm_service._generate_summary = fake_summary
+    try:
+        last_segment = None
+        events = []
+        for event in audio._run_pipeline("lecture.wav"):
+            events.append(event)
+            if event["event"] == "segment":
+                last_segment = time.monotonic()
+    finally:
+        audio._transcribe_segments = transcribe_segments
+        del audio.llm_service._generate_summary
+    ok = True
+
+    sent = " ".join(content for _, content in prompts)
+    missing = [i for i in range(len(segments)) if f"Segment{i} " not in sent]
+    ok &= check("every segment reaches an LLM prompt", not missing, f"missing segments {missing}")
+
+    after = sum(1 for started, _ in prompts if started >= last_segment)
+    ok &= check("at most one LLM call after the last segment", after <= 1,
+                f"{after} calls, prompt sizes {[len(c) for _, c in prompts]}")
+    ok &= check("chunks summarized while transcribing",
+                any(e["event"] == "chunk" for e in events) and events[-1]["event"] == "result")
+
+    return ok
+
+
+def test_admission_controller():
+    """Test admission accounting and rejection"""
+    print("\nTesting AdmissionController...")
+    controller = AdmissionController()
+    controller.max_inflight_bytes = 100
+    controller.operation_limits["llm"] = 1
+    ok = True
+
+    controller.admit_bytes(60)
+    try:
+        controller.admit_bytes(50)
+        ok &= check("byte budget rejects overflow", False, "admitted 110 of 100 bytes")
+    except AdmissionRejected:
+        ok &= check("byte budget rejects overflow", True)
+    controller.admit_bytes(40)
+    usage = controller.usage()
+    ok &= check("in-flight bytes and requests tracked",
+                usage["inflightBytes"] == 100 and usage["inflightRequests"] == 2, usage)
+    controller.release_bytes(60)
+    controller.release_bytes(40)
+    usage = controller.usage()
+    ok &= check("release returns the budget",
+                usage["inflightBytes"] == 0 and usage["inflightRequests"] == 0, usage)
+
+    with controller.operation("llm"):
+        try:
+            controller.acquire("llm")
+            ok &= check("operation limit rejects", False, "second llm slot granted")
+        except AdmissionRejected:
+            ok &= check("operation limit rejects", True)
+        ok &= check("try_acquire returns False when full", controller.try_acquire("llm") is False)
+    ok &= check("operation slot released on exit",
+                controller.usage()["operations"]["llm"]["active"] == 0)
+    ok &= check("rejections counted (try_acquire is not)",
+                controller.usage()["rejected"] == {"bytes": 1, "transcribe": 0, "llm": 1, "pdf": 0},
+                controller.usage()["rejected"])
+
+    try:
+        with controller.operation("llm"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    ok &= check("slot released when the operation raises",
+                controller.usage()["operations"]["llm"]["active"] == 0)
+
+    controller.acquire("llm")
+    threading.Timer(0.1, controller.release, args=("llm",)).start()
+    started = time.monotonic()
+    controller.acquire("llm", timeout=2)
+    waited = time.monotonic() - started
+    ok &= check("acquire(timeout) waits for a released slot", 0.05 < waited < 1.5, f"waited {waited:.2f}s")
+    controller.release("llm")
+
+    return ok
+
+
+def test_whisper_batcher():
+    """Test batch collection, failure handling and timestamp seeking"""
+    print("\nTesting WhisperBatcher...")
+    try:
+        import torch
+        from types import SimpleNamespace
+        from services.whisper_batcher import WhisperBatcher
+    except ImportError as e:
+        print(f"⚠ Skipping: {e}")
+        return True
+
+    # Only the attributes the batcher reads; decoding itself is replaced below
+    model = SimpleNamespace(is_multilingual=True, num_languages=99, device="cpu",
+                            dims=SimpleNamespace(n_mels=80, n_audio_ctx=1500))
+    batcher = WhisperBatcher(model)
+    batcher.max_batch_size = 4
+    batcher.batch_window = 0.05
+    batch_sizes = []
+
+    def fake_decode(mels):
+        batch_sizes.append(len(mels))
+        return [f"result-{i}" for i in range(len(mels))]
+
+    batcher._decode_batch = fake_decode
+    mel = torch.zeros(80, 3000)
+    ok = True
+
+    windows = [batcher._submit(mel) for _ in range(5)]
+    results = [w.future.result(timeout=2) for w in windows]
+    ok &= check("full batch sent at max size, rest in the next batch", batch_sizes == [4, 1], batch_sizes)
+    ok &= check("results routed back in order", results[:4] == [f"result-{i}" for i in range(4)], results)
+
+    batch_sizes.clear()
+    first = batcher._submit(mel)
+    time.sleep(0.2)
+    second = batcher._submit(mel)
+    first.future.result(timeout=2), second.future.result(timeout=2)
+    ok &= check("windows further apart than the batch window are not held back",
+                batch_sizes == [1, 1], batch_sizes)
+
+    def failing_decode(mels):
+        raise RuntimeError("bad mel")
+
+    batcher._decode_batch = failing_decode
+    logging.getLogger("services.whisper_batcher").disabled = True  # expected error
+    failed = [batcher._submit(mel) for _ in range(2)]
+    errors = []
+    for w in failed:
+        try:
+            w.future.result(timeout=2)
+        except RuntimeError as e:
+            errors.append(str(e))
+    ok &= check("decode failure resolves every waiting future", errors == ["bad mel", "bad mel"], errors)
+
+    batcher._decode_batch = lambda mels: []
+    logging.getLogger("services.whisper_batcher").disabled = False
+    short = batcher._submit(mel)
+    try:
+        short.future.result(timeout=2)
+        ok &= check("missing results resolve as errors", False, "got a result")
+    except RuntimeError:
+        ok &= check("missing results resolve as errors", True)
+
+    batch_sizes.clear()
+    batcher._decode_batch = fake_decode
+    kept = batcher._submit(mel)
+    kept.future.result(timeout=2)
+    ok &= check("worker survives failures", batch_sizes == [1], batch_sizes)
+
+    # Time queued behind the model lock does not count against the decode timeout
+    batcher._with_fallback = lambda mel, result: result
+    batcher._is_silence = lambda result: True
+    batcher.decode_timeout = 0.5
+    holder = threading.Thread(target=lambda: (batcher.model_lock.acquire(), time.sleep(1),
+                                              batcher.model_lock.release()))
+    holder.start()
+    time.sleep(0.05)
+    try:
+        batcher.transcribe(torch.zeros(16000).numpy())
+        ok &= check("timeout starts when decoding starts", True)
+    except TimeoutError as e:
+        ok &= check("timeout starts when decoding starts", False, e)
+    holder.join()
+
+    batcher._decode_batch = lambda mels: time.sleep(1) or fake_decode(mels)
+    try:
+        batcher.transcribe(torch.zeros(16000).numpy())
+        ok &= check("slow decode times out", False, "no timeout")
+    except TimeoutError as e:
+        ok &= check("timeout error explains itself", "0.5 seconds" in str(e), repr(e))
+    time.sleep(0.6)  # let the slow batch finish
+    del batcher._with_fallback, batcher._is_silence
+    batcher._decode_batch = fake_decode
+
+    tokenizer = batcher.tokenizer
+    ts = tokenizer.timestamp_begin
+    words = tokenizer.encode(" Hello there")
+    more = tokenizer.encode(" and more")
+    text, consumed = batcher._split_result(
+        SimpleNamespace(tokens=[ts, *words, ts + 100, ts + 100, *more]), 480000)
+    ok &= check("unfinished last segment dropped", text == "Hello there", text)
+    ok &= check("resume from the last complete timestamp", consumed == 100 * 320, consumed)
+    text, consumed = batcher._split_result(
+        SimpleNamespace(tokens=[ts, *words, ts + 100, ts + 100, *more, ts + 200]), 480000)
+    ok &= check("complete window consumed in full",
+                text == "Hello there and more" and consumed == 480000, (text, consumed))
+
+    return ok
+
+
+SAMPLE_ANALYSIS = {
+    "summary": "Forces & <motion>",
+    "keyTopics": ["Inertia", "Force"],
+    "topicTree": [{
+        "id": "1", "label": "Learning Topics", "children": [
+            {"id": "1-1", "label": "Inertia", "children": [{"id": "1-1-1", "label": "Mass"}]},
+            {"id": "1-2", "label": "Force"}
+        ]
+    }]
+}
+
+
+def test_layout():
+    """Test the layout shared by every export format"""
+    print("\nTesting iter_layout and validate_analysis...")
+    ok = True
+
+    blocks = [(b.kind, b.text, b.depth, b.level) for b in iter_layout(SAMPLE_ANALYSIS)]
+    ok &= check("blocks in document order", blocks == [
+        ("title", "Learning Map Analysis", 0, 0),
+        ("section", "Summary", 1, 0),
+        ("paragraph", "Forces & <motion>", 2, 0),
+        ("section", "Key Topics", 1, 0),
+        ("bullet", "Inertia", 2, 0),
+        ("bullet", "Force", 2, 0),
+        ("section", "Topic Tree", 1, 0),
+        ("node", "Learning Topics", 2, 0),
+        ("node", "Inertia", 3, 1),
+        ("node", "Mass", 4, 2),
+        ("node", "Force", 3, 1),
+    ], blocks)
+
+    sparse = [(b.kind, b.text) for b in iter_layout({"summary": None, "topicTree": None})]
+    ok &= check("null fields laid out like missing ones", sparse == [
+        ("title", "Learning Map Analysis"),
+        ("section", "Summary"),
+        ("paragraph", "No summary available."),
+    ], sparse)
+
+    ok &= check("valid data accepted", validate_analysis(SAMPLE_ANALYSIS) is None)
+    invalid = {
+        "non-object body": ["summary"],
+        "non-string summary": {"summary": 5},
+        "non-string key topic": {"keyTopics": ["a", None]},
+        "non-object tree node": {"topicTree": ["a"]},
+        "non-string label": {"topicTree": [{"label": 1}]},
+        "non-list children": {"topicTree": [{"label": "a", "children": "b"}]},
+    }
+    for name, data in invalid.items():
+        ok &= check(f"rejects {name}", validate_analysis(data) is not None, data)
+
+    deep = node = {"label": "0"}
+    for i in range(1, 60):
+        node["children"] = [{"label": str(i)}]
+        node = node["children"][0]
+    ok &= check("rejects trees deeper than the layout recursion allows",
+                validate_analysis({"topicTree": [deep]}) is not None)
+
+    return ok
+
+
+def test_renderers():
+    """Test each export format against the shared layout"""
+    print("\nTesting export renderers...")
+    from xml.etree import ElementTree
+    ok = True
+
+    def render(fmt):
+        return "".join(RENDERERS[fmt].render(SAMPLE_ANALYSIS))
+
+    markdown = render("markdown")
+    ok &= check("markdown nests tree nodes",
+                "- Learning Topics\n  - Inertia\n    - Mass\n  - Force\n" in markdown, markdown)
+
+    html = render("html")
+    ok &= check("html escapes text",
+                "Forces &amp; &lt;motion&gt;" in html and "<motion>" not in html)
+
+    def outline(element):
+        return [(child.get("text"), outline(child)) for child in element.findall("outline")]
+
+    try:
+        opml = ElementTree.fromstring(render("opml"))
+        opml_tree = outline(opml.find("body"))
+        ok &= check("opml parses", True)
+    except ElementTree.ParseError as e:
+        ok &= check("opml parses", False, e)
+        opml_tree = None
+
+    def nodes(node):
+        return [(child["label"], nodes(child)) for child in node["children"]]
+
+    try:
+        mind_map = json.loads(render("json"))
+        ok &= check("json parses", True)
+        ok &= check("json and opml have the same outline",
+                    [(mind_map["label"], nodes(mind_map))] == opml_tree, mind_map)
+    except ValueError as e:
+        ok &= check("json parses", False, e)
+
+    ok &= check("json is written in several chunks",
+                len(list(RENDERERS["json"].render(SAMPLE_ANALYSIS))) > 10)
+
+    try:
+        from reportlab.platypus import Paragraph, Spacer
+        from services.pdf_service import PDFService
+    except ImportError as e:
+        print(f"⚠ Skipping PDF layout: {e}")
+        return ok
+
+    # Flowables the PDF had before it moved to the shared layout, with text escaped
+    story = PDFService()._build_story(SAMPLE_ANALYSIS)
+    flowables = [
+        ("spacer", round(f.height)) if isinstance(f, Spacer) else (f.style.name, f.text)
+        for f in story
+    ]
+    ok &= check("pdf layout unchanged", flowables == [
+        ("CustomTitle", "Learning Map Analysis"), ("spacer", 22),
+        ("SectionTitle", "Summary"), ("SummaryStyle", "Forces &amp; &lt;motion&gt;"), ("spacer", 14),
+        ("SectionTitle", "Key Topics"), ("TopicStyle", "• Inertia"), ("TopicStyle", "• Force"),
+        ("spacer", 14),
+        ("SectionTitle", "Topic Tree"), ("TreeNodeLevel0", "Learning Topics"),
+        ("TreeNodeLevel1", "• Inertia"), ("TreeNodeLevel2", "• Mass"), ("TreeNodeLevel1", "• Force"),
+        ("spacer", 14),
+    ], flowables)
+
+    for name, data in [("sample", SAMPLE_ANALYSIS), ("markup characters", {"summary": "a & <b> c"})]:
+        try:
+            pdf = PDFService().generate_pdf(data).getvalue()
+            ok &= check(f"pdf builds ({name})", pdf.startswith(b"%PDF"))
+        except ValueError as e:
+            ok &= check(f"pdf builds ({name})", False, e)
+
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("Backend Service Checks")
+    print("=" * 60)
+    print()
+
+    results = [
+        test_merge_chunk_results(),
+        test_pipeline(),
+        test_admission_controller(),
+        test_whisper_batcher(),
+        test_layout(),
+        test_renderers(),
+    ]
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("✓ All checks passed!")
+        print("=" * 60)
+        return 0
+    print("✗ Some checks failed.")
+    print("=" * 60)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
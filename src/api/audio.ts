@@ -16,3 +16,23 @@ export async function uploadAudio(file: File) {
 
   return res.json();
 }
+
+// Transcribe and analyze in one request; the backend overlaps the two stages
+export async function processAudio(file: File) {
+  const formData = new FormData();
+  formData.append("audio", file);
+
+  const res = await fetch(`${FLASK_API_URL}/api/audio/process`, {
+    method: "POST",
+    body: formData,
+  });
+
+  const data = await res.json().catch(() => ({ error: "Audio processing failed" }));
+
+  // 400 responses still carry the transcript so the caller can explain what went wrong
+  if (!res.ok && !(res.status === 400 && typeof data.transcript === "string")) {
+    throw new Error(data.error || `Audio processing failed: ${res.statusText}`);
+  }
+
+  return data;
+}
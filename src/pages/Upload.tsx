@@ -6,7 +6,7 @@ import { Footer } from "@/components/Footer";
 import { Button } from "@/components/ui/button";
 import { ParticleBackground } from "@/components/ParticleBackground";
 import { useAnalyzeContent } from "@/hooks/useAnalyzeContent";
-import { uploadAudio } from "@/api/audio";
+import { processAudio as uploadAndAnalyzeAudio } from "@/api/audio";
 import { toast } from "sonner";
 import {
   FileText,
@@ -288,9 +288,9 @@ const UploadPage = () => {
   const processAudio = async (file: File) => {
     setIsProcessing(true);
     try {
-      const result = await uploadAudio(file);
+      const result = await uploadAndAnalyzeAudio(file);
       
-      if (result.success && result.transcript) {
+      if (result.transcript) {
         const transcript = result.transcript.trim();
         
         // Log transcript info for debugging
@@ -319,9 +319,9 @@ const UploadPage = () => {
           return;
         }
 
-        // Analyze the transcript
+        // Analysis ran alongside transcription on the backend
         try {
-          const analysisResult = await analyze(transcript, "text");
+          const analysisResult = result.analysis ?? await analyze(transcript, "text");
           
           // Store result and navigate
           sessionStorage.setItem("analysisResult", JSON.stringify(analysisResult));